@@ -1,20 +1,86 @@
 import sys
+import io
 import os
 import subprocess
 import re
 import tempfile
+import time
+import threading
 import json
+import shutil
+import functools
+import collections
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QFileDialog, 
                             QComboBox, QProgressBar, QListWidget, QStyle,
                             QMessageBox, QSlider, QTextEdit, QSizePolicy, QLineEdit, QSpinBox)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QSize, QObject, QRect, QPoint, QTimer
-from PyQt6.QtGui import QPalette, QColor, QIcon, QPainter, QPen, QBrush
+from PyQt6.QtCore import Qt, QThread, QThreadPool, QRunnable, QSignalBlocker, pyqtSignal, QUrl, QSize, QObject, QRect, QPoint, QTimer
+from PyQt6.QtGui import QPalette, QColor, QIcon, QPainter, QPen, QBrush, QTextCursor
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 import ffmpeg
 
+# orjson is optional; fall back to the stdlib for settings/cache files.
+# Both paths read and write UTF-8 bytes so files can be opened in binary mode.
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
 SETTINGS_FILE = os.path.expanduser('~/.brancoder_settings.json')
+CAPS_FILE = os.path.expanduser('~/.brancoder_caps.json')
+
+VIDEO_EXTS = ('.mp4', '.avi', '.mkv', '.mov', '.webm', '.flv', '.mpg', '.mpeg', '.ogg',
+              '.wmv', '.m4v', '.3gp', '.ts', '.asf', '.vob', '.f4v', '.m2ts')
+VIDEO_EXTS_SET = frozenset(VIDEO_EXTS)
+VIDEO_FILE_FILTER = "Video Files (" + " ".join(f"*{ext}" for ext in VIDEO_EXTS) + ")"
+
+# Only codec/duration/dimensions are needed, so keep ffprobe from reading deep into the file
+PROBE_LIMITS = {'probesize': '1M', 'analyzeduration': '1M'}
+
+# Fields from ffmpeg's -progress output shown in the conversion details
+PROGRESS_INFO_KEYS = ('frame', 'fps', 'total_size', 'out_time', 'bitrate', 'speed')
+PROGRESS_INFO_MAX_LINES = 500
+
+# Stylesheets applied once rather than rebuilt per widget/dialog
+RENDER_BTN_QSS = """
+    QPushButton {
+        background-color: #2a82da;
+        color: white;
+        padding: 8px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #1e6fc7;
+    }
+"""
+# Part of the window stylesheet, so every QMessageBox parented to it picks this up
+MSGBOX_QSS = """
+    QMessageBox {
+        background-color: #232323;
+        color: #ffffff;
+    }
+    QMessageBox QLabel {
+        color: #ffffff;
+    }
+    QMessageBox QPushButton {
+        color: #ffffff;
+        background-color: #414141;
+        border: 1px solid #555555;
+        padding: 5px;
+        min-width: 80px;
+    }
+    QMessageBox QPushButton:hover {
+        background-color: #4a4a4a;
+        border: 1px solid #666666;
+    }
+"""
 
 def check_ffmpeg():
     try:
@@ -29,49 +95,83 @@ def check_ffmpeg():
     except FileNotFoundError:
         return False, "FFmpeg is not installed or not in PATH"
 
+def probe_file(path):
+    probe = ffmpeg.probe(path, **PROBE_LIMITS)
+    fmt = probe.get('format', {})
+    if not float(fmt.get('duration') or 0):
+        bit_rate = float(fmt.get('bit_rate') or 0)
+        if bit_rate:
+            # Derive duration from size and bitrate instead of re-reading the file
+            fmt['duration'] = str(os.path.getsize(path) * 8 / bit_rate)
+        else:
+            # Duration may live past the probed range (e.g. mov/mp4 trailer)
+            probe = ffmpeg.probe(path)
+    return probe
+
+_TIME_FMT = "{:02d}:{:02d}:{:02d}".format
+
+@functools.lru_cache(maxsize=4096)
+def format_time(ms, fps):
+    total_seconds, rem = divmod(ms, 1000)
+    m, s = divmod(total_seconds, 60)
+    # Calculate frames based on video FPS
+    return _TIME_FMT(m, s, int(rem * fps / 1000))
+
 class VideoConverterThread(QThread):
     progress = pyqtSignal(int)
     finished = pyqtSignal()
     error = pyqtSignal(str)
     progress_info = pyqtSignal(str)
 
-    def __init__(self, input_file, output_file, format_options):
+    def __init__(self, input_file, output_file, format_options, duration):
         super().__init__()
         self.input_file = input_file
         self.output_file = output_file
         self.format_options = format_options
+        self.duration = duration  # Probed on the main thread, in seconds
+        # Last values sent to the GUI, used to skip redundant cross-thread signals
+        self._last_pct = -1
+        self._last_info_ts = 0.0
 
     def run(self):
         try:
-            # Get video duration for progress calculation
-            probe = ffmpeg.probe(self.input_file)
-            duration = float(probe['format']['duration'])
+            duration_us = max(1, int(self.duration * 1000000))
             
-            # Prepare FFmpeg command
+            # Prepare FFmpeg command; progress is reported as key=value lines on stdout
             stream = ffmpeg.input(self.input_file)
             stream = ffmpeg.output(stream, self.output_file, **self.format_options)
+            stream = stream.global_args('-progress', 'pipe:1', '-nostats')
             
             # Run FFmpeg with progress monitoring
-            process = ffmpeg.run_async(stream, pipe_stdout=True, pipe_stderr=True, overwrite_output=True)
+            process = ffmpeg.run_async(stream, pipe_stdout=True, overwrite_output=True)
             
-            # Monitor FFmpeg output
-            while True:
-                line = process.stderr.readline().decode('utf-8')
-                if not line and process.poll() is not None:
-                    break
-                if line:
-                    # Extract progress information
-                    if 'frame=' in line:
-                        self.progress_info.emit(line.strip())
-                        # Calculate progress percentage
-                        if 'time=' in line:
-                            time_match = re.search(r'time=(\d+:\d+:\d+.\d+)', line)
-                            if time_match:
-                                time_str = time_match.group(1)
-                                h, m, s = time_str.split(':')
-                                current_time = float(h) * 3600 + float(m) * 60 + float(s)
-                                progress = int((current_time / duration) * 100)
-                                self.progress.emit(progress)
+            # Monitor FFmpeg progress output, decoded a buffer at a time rather than per line
+            progress_out = io.TextIOWrapper(process.stdout, encoding='ascii', errors='ignore', newline='\n')
+            stats = {}
+            # An empty read is EOF: ffmpeg has closed the pipe
+            for line in iter(progress_out.readline, ''):
+                key, sep, value = line.rstrip().partition('=')
+                if not sep:
+                    continue
+                if key != 'progress':
+                    stats[key] = value
+                    continue
+                # End of a progress block: act on the complete snapshot once
+                out_time_us = stats.get('out_time_us', '')
+                if out_time_us.isdigit():
+                    progress = int(out_time_us) * 100 // duration_us
+                    if progress != self._last_pct:
+                        self._last_pct = progress
+                        self.progress.emit(progress)
+                # Report details at most every 100 ms, plus the final block
+                now = time.monotonic()
+                if value != 'end' and now - self._last_info_ts < 0.1:
+                    continue
+                self._last_info_ts = now
+                self.progress_info.emit(" ".join(
+                    f"{name}={stats.get(name, '')}" for name in PROGRESS_INFO_KEYS
+                ))
+            process.wait()
             
             if process.returncode == 0:
                 self.finished.emit()
@@ -95,12 +195,60 @@ class AspectRatioVideoWidget(QVideoWidget):
         self.setFixedHeight(height)
         super().resizeEvent(event)
 
+_FORMAT_LINE_RE = re.compile(r'\s*E')
+_CODEC_LINE_RE = re.compile(r'\s*[ D][ E][VAS][. ]')
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_formats_output():
+    return subprocess.run(['ffmpeg', '-hide_banner', '-formats'], capture_output=True, text=True, check=True).stdout
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_codecs_output():
+    # Shared by the video and audio-only codec lists so ffmpeg -codecs runs once
+    return subprocess.run(['ffmpeg', '-hide_banner', '-codecs'], capture_output=True, text=True, check=True).stdout
+
+@functools.lru_cache(maxsize=1)
+def _ffmpeg_encoders_output():
+    return subprocess.run(['ffmpeg', '-hide_banner', '-encoders'], capture_output=True, text=True, check=True).stdout
+
+# VAAPI is left out: its encoders need a -vaapi_device and hwupload'ed frames
+HW_ENCODER_SUFFIXES = ('_nvenc', '_qsv', '_videotoolbox', '_amf')
+
+def _hw_encoder_works(encoder):
+    # Hardware encoders are often compiled in without a usable device, so try encoding one frame
+    cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', 'color=size=256x256:rate=1',
+        '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-',
+    ]
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=3).returncode == 0
+    except Exception:
+        return False
+
+@functools.lru_cache(maxsize=1)
+def get_ffmpeg_hw_encoders():
+    try:
+        candidates = []
+        for line in _ffmpeg_encoders_output().splitlines():
+            # Lines look like: " V....D h264_nvenc    NVIDIA NVENC H.264 encoder"
+            parts = line.split()
+            if len(parts) > 1 and parts[0].startswith('V') and parts[1].endswith(HW_ENCODER_SUFFIXES):
+                candidates.append(parts[1])
+        if not candidates:
+            return ()
+        # Test encodes are mostly device-open latency, so run them side by side
+        with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+            works = list(executor.map(_hw_encoder_works, candidates))
+        return tuple(sorted(e for e, ok in zip(candidates, works) if ok))
+    except Exception as e:
+        return ()
+
 def get_ffmpeg_formats():
     try:
-        result = subprocess.run(['ffmpeg', '-hide_banner', '-formats'], capture_output=True, text=True, check=True)
         formats = []
-        for line in result.stdout.splitlines():
-            if re.match(r'\s*E', line):  # Lines starting with E (for muxing/writing)
+        for line in _ffmpeg_formats_output().splitlines():
+            if _FORMAT_LINE_RE.match(line):  # Lines starting with E (for muxing/writing)
                 parts = line.split()
                 if len(parts) > 1:
                     fmt = parts[1]
@@ -112,11 +260,10 @@ def get_ffmpeg_formats():
 
 def get_ffmpeg_video_codecs():
     try:
-        result = subprocess.run(['ffmpeg', '-hide_banner', '-codecs'], capture_output=True, text=True, check=True)
         codecs = []
-        for line in result.stdout.splitlines():
+        for line in _ffmpeg_codecs_output().splitlines():
             # Look for lines with E (encode) and V (video)
-            if re.match(r'\s*[ D][ E][VAS][. ]', line):
+            if _CODEC_LINE_RE.match(line):
                 if 'E' in line[2] and 'V' in line[3]:
                     parts = line.split()
                     if len(parts) > 1:
@@ -128,11 +275,10 @@ def get_ffmpeg_video_codecs():
 
 def get_ffmpeg_audio_only_codecs():
     try:
-        result = subprocess.run(['ffmpeg', '-hide_banner', '-codecs'], capture_output=True, text=True, check=True)
         audio_only = set()
-        for line in result.stdout.splitlines():
+        for line in _ffmpeg_codecs_output().splitlines():
             # Look for lines with E (encode) and A (audio), but not V (video)
-            if re.match(r'\s*[ D][ E][VAS][. ]', line):
+            if _CODEC_LINE_RE.match(line):
                 if 'E' in line[2] and 'A' in line[3] and 'V' not in line[3]:
                     parts = line.split()
                     if len(parts) > 1:
@@ -142,7 +288,16 @@ def get_ffmpeg_audio_only_codecs():
     except Exception as e:
         return set()
 
+def get_ffmpeg_codec_tables():
+    # Video and audio-only codecs from one ffmpeg -codecs scan
+    return get_ffmpeg_video_codecs(), get_ffmpeg_audio_only_codecs()
+
+# Formats whose muxer codec lists are fetched in the background at startup
+COMMON_FORMATS = ('mp4', 'mkv', 'mov', 'webm', 'avi')
+
+@functools.lru_cache(maxsize=64)
 def get_ffmpeg_muxer_codecs(format_name):
+    # Muxer -> codec support is fixed for a given ffmpeg binary
     try:
         result = subprocess.run(['ffmpeg', '-hide_banner', f'-h', f'muxer={format_name}'], capture_output=True, text=True, check=True)
         codecs = set()
@@ -154,34 +309,143 @@ def get_ffmpeg_muxer_codecs(format_name):
     except Exception as e:
         return []
 
-# Common codec option mappings
-CODEC_OPTIONS = {
-    'libx264': {'crf': (0, 51, 23), 'preset': ['ultrafast','superfast','veryfast','faster','fast','medium','slow','slower','veryslow'], 'passes': [1, 2]},
-    'libx265': {'crf': (0, 51, 28), 'preset': ['ultrafast','superfast','veryfast','faster','fast','medium','slow','slower','veryslow'], 'passes': [1, 2]},
-    'x264': {'crf': (0, 51, 23), 'preset': ['ultrafast','superfast','veryfast','faster','fast','medium','slow','slower','veryslow'], 'passes': [1, 2]},
-    'x265': {'crf': (0, 51, 28), 'preset': ['ultrafast','superfast','veryfast','faster','fast','medium','slow','slower','veryslow'], 'passes': [1, 2]},
-    'vp9': {'crf': (0, 63, 32), 'passes': [1, 2]},
-    'libvpx-vp9': {'crf': (0, 63, 32), 'passes': [1, 2]},
-    'mpeg4': {'bitrate': True, 'passes': [1, 2]},
-    'mpeg2video': {'bitrate': True, 'passes': [1, 2]},
-    'libxvid': {'bitrate': True, 'passes': [1, 2]},
+# Common codec option mappings (read-only; aliases share the same option sets)
+_PRESETS = ('ultrafast','superfast','veryfast','faster','fast','medium','slow','slower','veryslow')
+_NVENC_PRESETS = ('p1','p2','p3','p4','p5','p6','p7')
+_QSV_PRESETS = ('veryfast','faster','fast','medium','slow','slower','veryslow')
+_PRESETS_SET = frozenset(_PRESETS + _NVENC_PRESETS)
+_PASSES = (1, 2)
+_H264_OPTS = MappingProxyType({'crf': (0, 51, 23), 'preset': _PRESETS, 'passes': _PASSES})
+_H265_OPTS = MappingProxyType({'crf': (0, 51, 28), 'preset': _PRESETS, 'passes': _PASSES})
+_VP9_OPTS = MappingProxyType({'crf': (0, 63, 32), 'passes': _PASSES})
+_BITRATE_OPTS = MappingProxyType({'bitrate': True, 'passes': _PASSES})
+_NVENC_OPTS = MappingProxyType({'bitrate': True, 'preset': _NVENC_PRESETS})
+_QSV_OPTS = MappingProxyType({'bitrate': True, 'preset': _QSV_PRESETS})
+_HW_BITRATE_OPTS = MappingProxyType({'bitrate': True})
+CODEC_OPTIONS = MappingProxyType({
+    'libx264': _H264_OPTS,
+    'libx265': _H265_OPTS,
+    'x264': _H264_OPTS,
+    'x265': _H265_OPTS,
+    'vp9': _VP9_OPTS,
+    'libvpx-vp9': _VP9_OPTS,
+    'mpeg4': _BITRATE_OPTS,
+    'mpeg2video': _BITRATE_OPTS,
+    'libxvid': _BITRATE_OPTS,
+    # Hardware encoders (only listed when detected at startup)
+    'h264_nvenc': _NVENC_OPTS,
+    'hevc_nvenc': _NVENC_OPTS,
+    'av1_nvenc': _NVENC_OPTS,
+    'h264_qsv': _QSV_OPTS,
+    'hevc_qsv': _QSV_OPTS,
+    'av1_qsv': _QSV_OPTS,
+    'h264_videotoolbox': _HW_BITRATE_OPTS,
+    'hevc_videotoolbox': _HW_BITRATE_OPTS,
+    'h264_amf': _HW_BITRATE_OPTS,
+    'hevc_amf': _HW_BITRATE_OPTS,
+    'av1_amf': _HW_BITRATE_OPTS,
     # fallback for other codecs
+})
+
+# Advanced-options panel layout per codec, precomputed from CODEC_OPTIONS
+CodecUISpec = collections.namedtuple('CodecUISpec', 'has_crf crf_range has_bitrate presets passes_range')
+
+def _codec_ui_spec(opts):
+    passes = opts.get('passes')
+    return CodecUISpec(
+        has_crf='crf' in opts,
+        crf_range=opts.get('crf'),
+        has_bitrate=bool(opts.get('bitrate', False)),
+        presets=opts.get('preset', ()),
+        passes_range=(min(passes), max(passes)) if passes else None,
+    )
+
+CODEC_SPECS = MappingProxyType({name: _codec_ui_spec(opts) for name, opts in CODEC_OPTIONS.items()})
+NO_CODEC_SPEC = _codec_ui_spec({})
+
+# Empirical size model for CRF encodes: codec -> (reference crf, bits per pixel per frame at that crf)
+CRF_BPP_TABLE = {
+    'libx264': (23, 0.08),
+    'x264': (23, 0.08),
+    'libx265': (28, 0.05),
+    'x265': (28, 0.05),
+    'libvpx-vp9': (32, 0.06),
+    'vp9': (32, 0.06),
 }
+DEFAULT_AUDIO_BITRATE = 128000  # ffmpeg's aac default, in bits per second
 
-class DryRunWorker(QObject):
-    finished = pyqtSignal(bool, float, str)  # success, est_size_mb, error_msg
-    def __init__(self, input_file, output_format, format_options):
+# Throwaway dry-run output goes to RAM-backed /dev/shm when available (Linux), else the system temp dir
+SCRATCH_DIR = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+
+def parse_bitrate(value):
+    # ffmpeg-style bitrate such as '2000k' or '1.5M', in bits per second
+    value = value.strip()
+    scale = {'k': 1000, 'K': 1000, 'm': 1000000, 'M': 1000000}.get(value[-1:], 1)
+    if scale != 1:
+        value = value[:-1]
+    return float(value) * scale
+
+class DryRunSignals(QObject):
+    finished = pyqtSignal(bool, float, str, float)  # success, est_size_mb, error_msg, source duration
+
+class DryRunTask(QRunnable):
+    # Runs on the global thread pool; QRunnable can't emit, so signals live on a QObject
+    def __init__(self, input_file, output_format, format_options, probe=None):
         super().__init__()
+        self.signals = DryRunSignals()
         self.input_file = input_file
         self.output_format = output_format
         self.format_options = format_options
+        self.probe = probe  # Cached ffprobe result, or None to probe on the pool thread
+        self.duration = 0.0  # Source duration in seconds, filled in by run()
+        self.video_stream = None
+        self.has_audio = False
+    def output_duration(self):
+        # Length of the render in seconds: the in/out trim if set, else the whole source
+        trimmed = float(self.format_options.get('t', 0))
+        return trimmed if trimmed > 0 else self.duration
+    def estimate_size(self):
+        # Estimated output size in bytes from the target bitrate or CRF, or None if it must be measured
+        opts = self.format_options
+        if 'b:v' in opts:
+            video_bps = parse_bitrate(opts['b:v'])
+        elif 'crf' in opts and opts.get('vcodec') in CRF_BPP_TABLE and self.video_stream:
+            ref_crf, ref_bpp = CRF_BPP_TABLE[opts['vcodec']]
+            # Bitrate roughly halves for every 6 CRF steps
+            bpp = ref_bpp * 2 ** ((ref_crf - int(opts['crf'])) / 6)
+            num, den = map(int, self.video_stream.get('r_frame_rate', '0/0').split('/'))
+            if not num or not den:
+                return None
+            video_bps = bpp * int(self.video_stream['width']) * int(self.video_stream['height']) * num / den
+        else:
+            return None
+        audio_bps = DEFAULT_AUDIO_BITRATE if opts.get('acodec') and self.has_audio else 0
+        return int((video_bps + audio_bps) * self.output_duration() / 8)
     def run(self):
+        tmp_path = None
         try:
-            with tempfile.NamedTemporaryFile(suffix=f'.{self.output_format}', delete=False) as tmp:
+            probe = self.probe if self.probe is not None else probe_file(self.input_file)
+            self.duration = float(probe['format']['duration'])
+            self.video_stream = next((s for s in probe['streams'] if s['codec_type'] == 'video'), None)
+            self.has_audio = any(s['codec_type'] == 'audio' for s in probe['streams'])
+            est_size = self.estimate_size()
+            with tempfile.NamedTemporaryFile(suffix=f'.{self.output_format}', dir=SCRATCH_DIR, delete=False) as tmp:
                 tmp_path = tmp.name
+            if est_size is None:
+                # Measure a 2 second sample from mid-file, past the opening keyframe
+                sample_start = max(0.0, self.duration / 2 - 1)
+                input_args = ['-ss', str(sample_start)]
+                limit_args = ['-t', '2']
+            else:
+                # Size is known; one frame is enough to check the codec/format combination.
+                # The time cap bounds inputs with no video stream, where -frames:v never triggers.
+                input_args = []
+                limit_args = ['-frames:v', '1', '-t', '1']
+            # Probe/buffering limits must come before -i to apply to the input
             dry_run_cmd = [
                 'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
-                '-i', self.input_file, '-t', '2',
+                '-probesize', '32k', '-analyzeduration', '0', '-fflags', '+nobuffer',
+                *input_args, '-i', self.input_file, *limit_args,
             ]
             if 'vcodec' in self.format_options:
                 dry_run_cmd += ['-c:v', self.format_options['vcodec']]
@@ -198,18 +462,29 @@ class DryRunWorker(QObject):
             dry_run_cmd.append(tmp_path)
             result = subprocess.run(dry_run_cmd, capture_output=True, text=True)
             if result.returncode != 0:
-                os.remove(tmp_path)
-                self.finished.emit(False, 0, result.stderr)
+                self.signals.finished.emit(False, 0, result.stderr, self.duration)
                 return
-            sample_size = os.path.getsize(tmp_path)
-            probe = ffmpeg.probe(self.input_file)
-            duration = float(probe['format']['duration'])
-            est_size = int(sample_size * (duration / 2))
+            if est_size is None:
+                sample_size = os.path.getsize(tmp_path)
+                est_size = int(sample_size * (self.output_duration() / 2))
             est_size_mb = est_size / (1024 * 1024)
-            os.remove(tmp_path)
-            self.finished.emit(True, est_size_mb, "")
+            self.signals.finished.emit(True, est_size_mb, "", self.duration)
         except Exception as e:
-            self.finished.emit(False, 0, str(e))
+            self.signals.finished.emit(False, 0, str(e), self.duration)
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+class ProbeWorker(QObject):
+    finished = pyqtSignal(str, dict, str)  # path, probe, error_msg
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+    def run(self):
+        try:
+            self.finished.emit(self.path, probe_file(self.path), "")
+        except Exception as e:
+            self.finished.emit(self.path, {}, str(e))
 
 class TimelineWidget(QWidget):
     positionChanged = pyqtSignal(int)
@@ -229,7 +504,8 @@ class TimelineWidget(QWidget):
         self.dragging = None  # None, 'position', 'in', or 'out'
         self.drag_start_pos = None
         self.drag_start_value = None
-        
+        self._paint_pending = False  # A coalesced repaint is already queued
+
         # Colors
         self.timeline_color = QColor(0, 0, 0)  # Black for main position marker
         self.in_point_color = QColor(42, 130, 218)  # Blue
@@ -241,74 +517,91 @@ class TimelineWidget(QWidget):
         self.marker_height = 20
         self.timeline_height = 8
         
+        # Reusable paint geometry, kept in sync by _update_geometry
+        self._timeline_rect = QRect()
+        self._in_rect = QRect(0, 0, self.marker_width, self.marker_height)
+        self._out_rect = QRect(0, 0, self.marker_width, self.marker_height)
+        self._pos_rect = QRect(0, 0, self.marker_width, self.marker_height)
+        
         # Set fixed height
         self.setFixedHeight(60)
+        self._update_geometry()
+
+    def _update_geometry(self):
+        # Pixels per millisecond and marker placement only change on resize or new duration
+        self._scale = self.width() / max(1, self.duration)
+        self._marker_y = (self.height() - self.marker_height) // 2
+        self._timeline_rect.setRect(0, (self.height() - self.timeline_height) // 2,
+                                    self.width(), self.timeline_height)
+        for rect in (self._in_rect, self._out_rect, self._pos_rect):
+            rect.moveTop(self._marker_y)
+
+    def resizeEvent(self, event):
+        self._update_geometry()
+        super().resizeEvent(event)
+
+    def _request_update(self):
+        # Coalesce state changes from one event-loop pass into a single repaint
+        if not self._paint_pending:
+            self._paint_pending = True
+            QTimer.singleShot(0, self._do_update)
+
+    def _do_update(self):
+        self._paint_pending = False
+        self.update()
 
     def setDuration(self, duration):
         self.duration = duration
         self.out_point = duration
-        self.update()
+        self._update_geometry()
+        self._request_update()
 
     def setPosition(self, position):
         self.position = position
-        self.update()
+        self._request_update()
 
     def setInPoint(self, in_point):
         self.in_point = in_point
-        self.update()
+        self._request_update()
 
     def setOutPoint(self, out_point):
         self.out_point = out_point
-        self.update()
+        self._request_update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # Draw timeline background
-        timeline_rect = QRect(0, (self.height() - self.timeline_height) // 2,
-                            self.width(), self.timeline_height)
-        painter.fillRect(timeline_rect, QColor(42, 42, 42))
+        painter.fillRect(self._timeline_rect, QColor(42, 42, 42))
         
-        # Draw selection range
         if self.duration > 0:
-            in_x = int(self.in_point * self.width() / self.duration)
-            out_x = int(self.out_point * self.width() / self.duration)
-            selection_rect = QRect(in_x, 0, out_x - in_x, self.height())
-            painter.fillRect(selection_rect, self.selection_color)
-        
-        # Draw in/out markers
-        if self.duration > 0:
-            # In point marker
-            in_x = int(self.in_point * self.width() / self.duration)
-            in_rect = QRect(in_x - self.marker_width // 2,
-                          (self.height() - self.marker_height) // 2,
-                          self.marker_width, self.marker_height)
-            painter.fillRect(in_rect, self.in_point_color)
+            in_x = int(self.in_point * self._scale)
+            out_x = int(self.out_point * self._scale)
+            pos_x = int(self.position * self._scale)
+            half_marker = self.marker_width // 2
             
-            # Out point marker
-            out_x = int(self.out_point * self.width() / self.duration)
-            out_rect = QRect(out_x - self.marker_width // 2,
-                           (self.height() - self.marker_height) // 2,
-                           self.marker_width, self.marker_height)
-            painter.fillRect(out_rect, self.out_point_color)
-        
-        # Draw position marker last so it's on top
-        if self.duration > 0:
-            pos_x = int(self.position * self.width() / self.duration)
-            pos_rect = QRect(pos_x - self.marker_width // 2,
-                           (self.height() - self.marker_height) // 2,
-                           self.marker_width, self.marker_height)
-            painter.fillRect(pos_rect, self.timeline_color)
+            # Draw selection range
+            painter.fillRect(QRect(in_x, 0, out_x - in_x, self.height()), self.selection_color)
+            
+            # Draw in/out markers
+            self._in_rect.moveLeft(in_x - half_marker)
+            painter.fillRect(self._in_rect, self.in_point_color)
+            self._out_rect.moveLeft(out_x - half_marker)
+            painter.fillRect(self._out_rect, self.out_point_color)
+            
+            # Draw position marker last so it's on top
+            self._pos_rect.moveLeft(pos_x - half_marker)
+            painter.fillRect(self._pos_rect, self.timeline_color)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             pos = event.position().x()
             if self.duration > 0:
                 # Check which marker is being clicked
-                in_x = int(self.in_point * self.width() / self.duration)
-                out_x = int(self.out_point * self.width() / self.duration)
-                pos_x = int(self.position * self.width() / self.duration)
+                in_x = int(self.in_point * self._scale)
+                out_x = int(self.out_point * self._scale)
+                pos_x = int(self.position * self._scale)
                 
                 # Define click areas for each marker
                 in_rect = QRect(in_x - self.marker_width, 0, self.marker_width * 2, self.height())
@@ -327,11 +620,11 @@ class TimelineWidget(QWidget):
                     self.dragging = 'position'
                 else:
                     # Click on timeline - set position
-                    new_pos = int(pos * self.duration / self.width())
+                    new_pos = int(pos / self._scale)
                     new_pos = max(self.in_point, min(self.out_point, new_pos))
                     self.position = new_pos
                     self.positionChanged.emit(self.position)
-                    self.update()
+                    self._request_update()
                 
                 self.drag_start_pos = pos
                 if self.dragging == 'in':
@@ -345,7 +638,7 @@ class TimelineWidget(QWidget):
         if self.dragging and self.duration > 0:
             pos = event.position().x()
             delta = pos - self.drag_start_pos
-            new_value = int(self.drag_start_value + (delta * self.duration / self.width()))
+            new_value = int(self.drag_start_value + delta / self._scale)
             
             if self.dragging == 'in':
                 new_value = max(0, min(self.out_point, new_value))
@@ -360,7 +653,7 @@ class TimelineWidget(QWidget):
                 self.position = new_value
                 self.positionChanged.emit(new_value)
             
-            self.update()
+            self._request_update()
 
     def mouseReleaseEvent(self, event):
         self.dragging = None
@@ -373,33 +666,82 @@ class VideoConverter(QMainWindow):
         self.setWindowTitle("Brancoder")
         self.setMinimumSize(1200, 800)
         self.current_video_path = None
+        self._current_video_stem = ''  # File name of current_video_path without extension
         self.output_directory = None
+        self._output_dir_basename = ''
+        self.last_open_dir = ''
         self.video_fps = 30  # Default fps, will be updated when video is loaded
+        self._frame_duration_ms = max(1, round(1000 / self.video_fps))
+        self._time_label_key = None  # Inputs of the last time label text
+        self._last_visibility_codec = None  # Codec the advanced options were last laid out for
+        self._pending_crf = None  # Latest CRF slider value awaiting a label update
+        self._probe_cache = {}  # (path, mtime_ns, size) -> ffprobe result
+        self._format_options_templates = {}  # codec -> static ffmpeg output options
+        self._probe_jobs = {}  # path -> (thread, worker, cache key) for in-flight probes
         
         # Enable keyboard tracking
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         
-        # Check FFmpeg installation
-        ffmpeg_installed, ffmpeg_version = check_ffmpeg()
-        if not ffmpeg_installed:
-            QMessageBox.critical(self, "FFmpeg Error", 
-                               f"FFmpeg is not properly installed: {ffmpeg_version}\n"
-                               "Please install FFmpeg and make sure it's in your system PATH.")
-            sys.exit(1)
-        else:
-            print(f"FFmpeg version: {ffmpeg_version}")
+        # Formats/codecs only change with the ffmpeg binary, so reuse them from disk when possible
+        caps_key = self._ffmpeg_binary_key()
+        caps = self._load_capabilities_cache(caps_key)
         
-        self.settings = self.load_settings()
-        self.ffmpeg_formats = get_ffmpeg_formats()
-        self.ffmpeg_codecs = get_ffmpeg_video_codecs()
-        self.audio_only_codecs = get_ffmpeg_audio_only_codecs()
+        # Query FFmpeg in the background while the rest of the window is set up.
+        # Both codec lists share one cached ffmpeg -codecs run, so they stay in one task.
+        # Hardware encoders depend on the GPU and driver, not the binary, so they're tested every launch.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            fut_version = executor.submit(check_ffmpeg)
+            fut_hw = executor.submit(get_ffmpeg_hw_encoders)
+            fut_formats = fut_codecs = None
+            if caps is None:
+                fut_formats = executor.submit(get_ffmpeg_formats)
+                fut_codecs = executor.submit(get_ffmpeg_codec_tables)
+            
+            self._settings_cache = self.load_settings()
+            self.setup_dark_theme()
+            self.setup_media_player()
+            
+            # Check FFmpeg installation
+            ffmpeg_installed, ffmpeg_version = fut_version.result()
+            if not ffmpeg_installed:
+                QMessageBox.critical(self, "FFmpeg Error", 
+                                   f"FFmpeg is not properly installed: {ffmpeg_version}\n"
+                                   "Please install FFmpeg and make sure it's in your system PATH.")
+                sys.exit(1)
+            else:
+                print(f"FFmpeg version: {ffmpeg_version}")
+            
+            if caps is not None and caps.get('version') == ffmpeg_version:
+                self.ffmpeg_formats = caps['formats']
+                self.ffmpeg_codecs = caps['video_codecs']
+                self.audio_only_codecs = caps['audio_only_codecs']
+            else:
+                if fut_formats is None:  # Cached capabilities are from another ffmpeg version
+                    fut_formats = executor.submit(get_ffmpeg_formats)
+                    fut_codecs = executor.submit(get_ffmpeg_codec_tables)
+                self.ffmpeg_formats = fut_formats.result()
+                self.ffmpeg_codecs, self.audio_only_codecs = fut_codecs.result()
+                self._save_capabilities_cache(caps_key, ffmpeg_version)
+            # Working hardware encoders are offered alongside the software codecs
+            self.hw_encoders = fut_hw.result()
+            self.ffmpeg_codecs = sorted(set(self.ffmpeg_codecs).union(self.hw_encoders))
+        # Membership-test forms; the lists keep ffmpeg's order for the combos
+        self.audio_only_codecs = frozenset(self.audio_only_codecs)
+        self.hw_encoders = frozenset(self.hw_encoders)
+        self._ffmpeg_formats_set = frozenset(self.ffmpeg_formats)
         self.current_allowed_codecs = self.ffmpeg_codecs.copy()
         self.selected_codec = None
         
+        # Settings changes are written at most once per 500 ms, off the GUI thread
+        self._settings_write_lock = threading.Lock()
+        self._settings_flush_timer = QTimer(self)
+        self._settings_flush_timer.setSingleShot(True)
+        self._settings_flush_timer.setInterval(500)
+        self._settings_flush_timer.timeout.connect(self.flush_settings)
+        
         self.setup_ui()
-        self.setup_dark_theme()
-        self.setup_media_player()
         self.restore_settings()
+        self.prefetch_muxer_codecs()
 
     def setup_media_player(self):
         self.media_player = QMediaPlayer()
@@ -416,6 +758,11 @@ class VideoConverter(QMainWindow):
         self.media_player.positionChanged.connect(self.position_changed)
         self.media_player.durationChanged.connect(self.duration_changed)
         self.media_player.playbackStateChanged.connect(self.playback_state_changed)
+        
+        # Output preview player, reused for every finished conversion
+        self.output_preview_player = QMediaPlayer(self)
+        self.output_preview_audio = QAudioOutput(self)
+        self.output_preview_player.setAudioOutput(self.output_preview_audio)
 
     def handle_media_error(self, error, error_string):
         QMessageBox.warning(self, "Media Player Error", 
@@ -427,18 +774,46 @@ class VideoConverter(QMainWindow):
             self.media_player.setPosition(0)
             self.media_player.play()
 
-    def on_file_selected(self, current, previous):
-        if current is None:
-            self.file_info_box.clear()
+    def _probe_key(self, path):
+        # Reuse ffprobe output until the file on disk changes
+        st = os.stat(path)
+        return (path, st.st_mtime_ns, st.st_size)
+
+    def start_probe(self, path):
+        if path in self._probe_jobs:
             return
-        self.current_video_path = current.text()
-        if not os.path.exists(self.current_video_path):
-            QMessageBox.warning(self, "File Error", f"Selected file does not exist: {self.current_video_path}")
-            self.file_info_box.clear()
+        try:
+            key = self._probe_key(path)
+        except OSError:
+            return
+        if key in self._probe_cache:
+            return
+        thread = QThread()
+        worker = ProbeWorker(path)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.finished.connect(self.on_probe_finished)
+        worker.finished.connect(thread.quit)
+        worker.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        # Keep the thread and worker alive until the thread has stopped
+        thread.finished.connect(lambda: self._probe_jobs.pop(path, None))
+        self._probe_jobs[path] = (thread, worker, key)
+        thread.start()
+
+    def on_probe_finished(self, path, probe, error_msg):
+        job = self._probe_jobs.get(path)
+        if not error_msg and job is not None:
+            self._probe_cache[job[2]] = probe
+        if path != self.current_video_path:
             return
-        # Show file info
+        if error_msg:
+            self.file_info_box.setText(f"Could not read file info: {error_msg}")
+        else:
+            self.show_file_info(probe)
+
+    def show_file_info(self, probe):
         try:
-            probe = ffmpeg.probe(self.current_video_path)
             fmt = probe['format']
             streams = probe['streams']
             v_stream = next((s for s in streams if s['codec_type'] == 'video'), None)
@@ -447,9 +822,10 @@ class VideoConverter(QMainWindow):
             # Get video FPS
             if v_stream and 'r_frame_rate' in v_stream:
                 num, den = map(int, v_stream['r_frame_rate'].split('/'))
-                self.video_fps = num / den if den != 0 else 30
+                self.video_fps = num / den if num and den else 30
             else:
                 self.video_fps = 30  # Default if not found
+            self._frame_duration_ms = max(1, round(1000 / self.video_fps))
             
             info = f"File: {os.path.basename(self.current_video_path)}\n"
             info += f"Duration: {float(fmt['duration']):.2f} sec\n"
@@ -458,10 +834,34 @@ class VideoConverter(QMainWindow):
                 info += f" {v_stream.get('r_frame_rate', '')}fps\n"
             if a_stream:
                 info += f"Audio: {a_stream['codec_name']} {a_stream.get('channels', '')}ch\n"
-            info += f"Size: {int(fmt['size'])//1024} KB\n"
+            info += f"Size: {os.path.getsize(self.current_video_path)//1024} KB\n"
             self.file_info_box.setText(info)
         except Exception as e:
             self.file_info_box.setText(f"Could not read file info: {e}")
+
+    def on_file_selected(self, current, previous):
+        if current is None:
+            self.file_info_box.clear()
+            return
+        self.current_video_path = current.text()
+        self._current_video_stem = os.path.splitext(os.path.basename(self.current_video_path))[0]
+        if not os.path.exists(self.current_video_path):
+            QMessageBox.warning(self, "File Error", f"Selected file does not exist: {self.current_video_path}")
+            self.file_info_box.clear()
+            return
+        # Show file info; cached probes are shown immediately, others load in the background
+        probe = self._probe_cache.get(self._probe_key(self.current_video_path))
+        if probe is not None:
+            self.show_file_info(probe)
+        else:
+            self.file_info_box.clear()
+            self.start_probe(self.current_video_path)
+        # Prefetch neighbouring files so stepping through the list stays instant
+        row = self.file_list.row(current)
+        for neighbour in (row - 1, row + 1):
+            item = self.file_list.item(neighbour)
+            if item is not None:
+                self.start_probe(item.text())
         # Reset the media player
         self.media_player.stop()
         self.media_player.setSource(QUrl())  # Clear source
@@ -546,7 +946,7 @@ class VideoConverter(QMainWindow):
                 background-color: #2a82da;
                 width: 10px;
             }
-        """)
+        """ + MSGBOX_QSS)
 
     def setup_ui(self):
         # Main widget and layout
@@ -668,6 +1068,7 @@ class VideoConverter(QMainWindow):
         codec_label = QLabel("Video Codec:")
         self.codec_combo = QComboBox()
         self.populate_codec_combo(self.ffmpeg_codecs)
+        self.select_preferred_hw_encoder(self.ffmpeg_codecs)
         self.codec_combo.currentTextChanged.connect(self.update_advanced_options_visibility)
         codec_layout.addWidget(codec_label)
         codec_layout.addWidget(self.codec_combo)
@@ -701,7 +1102,7 @@ class VideoConverter(QMainWindow):
         self.crf_slider.setMaximum(51)
         self.crf_slider.setValue(23)
         self.crf_value_label = QLabel("23")
-        self.crf_slider.valueChanged.connect(lambda v: self.crf_value_label.setText(str(v)))
+        self.crf_slider.valueChanged.connect(self._on_crf_changed)
         self.crf_layout.addWidget(self.crf_label)
         self.crf_layout.addWidget(self.crf_slider)
         self.crf_layout.addWidget(self.crf_value_label)
@@ -752,6 +1153,7 @@ class VideoConverter(QMainWindow):
         self.output_video_widget = AspectRatioVideoWidget((16, 9))
         self.output_video_widget.setStyleSheet("background-color: #2a2a2a;")
         self.output_video_widget.setFixedWidth(400)
+        self.output_preview_player.setVideoOutput(self.output_video_widget)
         output_container_layout.addWidget(self.output_video_widget)
         right_layout.addWidget(output_container)
         # Output file name input
@@ -772,17 +1174,7 @@ class VideoConverter(QMainWindow):
         right_layout.addLayout(save_render_layout)
         render_button = QPushButton("Render")
         render_button.clicked.connect(self.convert_video)
-        render_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2a82da;
-                color: white;
-                padding: 8px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #1e6fc7;
-            }
-        """)
+        render_button.setStyleSheet(RENDER_BTN_QSS)
         right_layout.addWidget(render_button)
         # Conversion details
         progress_info_label = QLabel("Conversion Details")
@@ -798,6 +1190,12 @@ class VideoConverter(QMainWindow):
             }
         """)
         self.progress_info_text.setMaximumHeight(100)
+        self.progress_info_text.document().setMaximumBlockCount(PROGRESS_INFO_MAX_LINES)
+        # FFmpeg details lines are buffered and appended in batches every 100 ms
+        self._progress_buffer = collections.deque(maxlen=PROGRESS_INFO_MAX_LINES)
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(100)
+        self._progress_timer.timeout.connect(self._flush_progress)
         right_layout.addWidget(progress_info_label)
         right_layout.addWidget(self.progress_info_text)
         
@@ -819,14 +1217,55 @@ class VideoConverter(QMainWindow):
         layout.setStretch(1, 2)  # Middle panel
         layout.setStretch(2, 1)  # Right panel
 
+        # The initial codec (possibly a preselected GPU encoder) was chosen before the
+        # combo was connected, so lay out its advanced options now that they exist
+        self.update_advanced_options_visibility(self.codec_combo.currentText())
+
     def load_settings(self):
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                with open(SETTINGS_FILE, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                return {}
-        return {}
+        # A missing, unreadable, empty or corrupt file all mean "no saved settings"
+        try:
+            with open(SETTINGS_FILE, 'rb') as f:
+                return _loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _ffmpeg_binary_key(self):
+        path = shutil.which('ffmpeg')
+        if not path:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [path, st.st_mtime_ns, st.st_size]
+
+    def _load_capabilities_cache(self, key):
+        if key is None:
+            return None
+        try:
+            with open(CAPS_FILE, 'rb') as f:
+                caps = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if caps.get('key') != key or 'video_codecs' not in caps:
+            return None
+        return caps
+
+    def _save_capabilities_cache(self, key, version):
+        if key is None:
+            return
+        caps = {
+            'key': key,
+            'version': version,
+            'formats': self.ffmpeg_formats,
+            'video_codecs': self.ffmpeg_codecs,
+            'audio_only_codecs': sorted(self.audio_only_codecs),
+        }
+        try:
+            with open(CAPS_FILE, 'wb') as f:
+                f.write(_dumps(caps))
+        except Exception:
+            pass
 
     def save_settings(self):
         s = {
@@ -835,51 +1274,83 @@ class VideoConverter(QMainWindow):
             'quality': self.quality_combo.currentText(),
             'output_file_name': self.file_name_input.text(),
             'save_location': self.output_directory,
-            'last_open_dir': getattr(self, 'last_open_dir', ''),
+            'last_open_dir': self.last_open_dir,
             'crf': self.crf_slider.value(),
             'bitrate': self.bitrate_input.text(),
             'preset': self.preset_combo.currentText() if self.preset_combo.isVisible() else '',
             'passes': self.passes_spin.value(),
         }
-        try:
-            with open(SETTINGS_FILE, 'w') as f:
-                json.dump(s, f)
-        except Exception:
-            pass
+        if s == self._settings_cache:
+            return
+        self._settings_cache = s
+        self._settings_flush_timer.start()
+
+    def flush_settings(self, blocking=False):
+        self._settings_flush_timer.stop()
+        if blocking:
+            self.write_settings_file()
+        else:
+            QThreadPool.globalInstance().start(self.write_settings_file)
+
+    def write_settings_file(self):
+        with self._settings_write_lock:
+            # Read the settings under the lock so a late-running write can't store an older snapshot;
+            # save_settings replaces the dict rather than mutating it
+            s = self._settings_cache
+            try:
+                with open(SETTINGS_FILE, 'wb') as f:
+                    f.write(_dumps(s))
+            except Exception:
+                pass
 
     def restore_settings(self):
-        s = self.settings
+        s = self._settings_cache
         if not s:
             return
-        if 'format' in s and s['format'] in self.ffmpeg_formats:
+        # Restore with change signals blocked, then lay out the codec's options once
+        blockers = [QSignalBlocker(w) for w in (self.format_combo, self.codec_combo)]
+        if 'format' in s and s['format'] in self._ffmpeg_formats_set and s['format'] != self.format_combo.currentText():
             self.format_combo.setCurrentText(s['format'])
+            self.update_codec_list_for_format(s['format'])
         if 'codec' in s:
             self.codec_combo.setCurrentText(s['codec'])
+        for blocker in blockers:
+            blocker.unblock()
+        # Resets the option widgets to codec defaults, so it runs before their saved values
+        self.update_advanced_options_visibility(self.codec_combo.currentText())
+        blockers = [QSignalBlocker(w) for w in (
+            self.quality_combo, self.file_name_input, self.crf_slider,
+            self.bitrate_input, self.preset_combo, self.passes_spin,
+        )]
         if 'quality' in s:
             self.quality_combo.setCurrentText(s['quality'])
         if 'output_file_name' in s:
             self.file_name_input.setText(s['output_file_name'])
         if 'save_location' in s and s['save_location']:
             self.output_directory = s['save_location']
-            self.save_location_label.setText(f"Save location: {os.path.basename(self.output_directory)}")
+            self._output_dir_basename = os.path.basename(self.output_directory)
+            self.save_location_label.setText(f"Save location: {self._output_dir_basename}")
         if 'last_open_dir' in s:
             self.last_open_dir = s['last_open_dir']
         if 'crf' in s:
             self.crf_slider.setValue(s['crf'])
         if 'bitrate' in s:
             self.bitrate_input.setText(s['bitrate'])
-        if 'preset' in s and s['preset']:
+        if 'preset' in s and s['preset'] in _PRESETS_SET:
             self.preset_combo.setCurrentText(s['preset'])
         if 'passes' in s:
             self.passes_spin.setValue(s['passes'])
+        for blocker in blockers:
+            blocker.unblock()
+        self._on_crf_changed(self.crf_slider.value())
 
     def open_file(self):
-        dir_ = getattr(self, 'last_open_dir', '')
+        dir_ = self.last_open_dir
         file_name, _ = QFileDialog.getOpenFileName(
             self,
             "Open Video File",
             dir_,
-            "Video Files (*.mp4 *.avi *.mkv *.mov *.webm *.flv *.mpg *.mpeg *.ogg *.wmv *.m4v *.3gp *.ts *.asf *.vob *.f4v *.m2ts)"
+            VIDEO_FILE_FILTER
         )
         if file_name:
             self.file_list.addItem(file_name)
@@ -907,25 +1378,31 @@ class VideoConverter(QMainWindow):
         out_point = self.timeline_widget.out_point / 1000  # Convert to seconds
         duration = out_point - in_point
         
+        # Only use a probe that's already cached; on a miss the dry run probes off the GUI thread
+        try:
+            probe = self._probe_cache.get(self._probe_key(input_file))
+        except OSError as e:
+            self.status_label.setText(f"Could not read file info: {e}")
+            return
+        
         # Gather advanced options
         codec = self.selected_codec or self.codec_combo.currentText().split()[0]
-        opts = CODEC_OPTIONS.get(codec, {})
-        format_options = {
-            'vcodec': codec,
-            'acodec': 'aac',
-            'ss': str(in_point),  # Start time
-            't': str(duration)    # Duration
-        }
-        if 'crf' in opts and self.advanced_group.isVisible():
-            format_options['crf'] = str(self.crf_slider.value())
-        if opts.get('bitrate', False) and self.advanced_group.isVisible():
-            br = self.bitrate_input.text().strip()
-            if br:
-                format_options['b:v'] = f'{br}k'
-        if 'preset' in opts and self.advanced_group.isVisible():
-            format_options['preset'] = self.preset_combo.currentText()
-        if 'passes' in opts and self.advanced_group.isVisible():
-            format_options['pass'] = str(self.passes_spin.value())
+        spec = CODEC_SPECS.get(codec, NO_CODEC_SPEC)
+        format_options = dict(self._format_options_template(codec))
+        format_options['ss'] = str(in_point)  # Start time
+        format_options['t'] = str(duration)    # Duration
+        if self.advanced_group.isVisible():
+            if spec.has_crf:
+                format_options['crf'] = str(self.crf_slider.value())
+            if spec.has_bitrate:
+                br = self.bitrate_input.text().strip()
+                if br:
+                    format_options['b:v'] = f'{br}k'
+            if spec.presets:
+                format_options['preset'] = self.preset_combo.currentText()
+            if spec.passes_range:
+                format_options['pass'] = str(self.passes_spin.value())
+        self._progress_buffer.clear()
         self.progress_info_text.clear()
         self.progress_bar.setValue(0)
         self.status_label.setText("Checking settings...")
@@ -933,20 +1410,14 @@ class VideoConverter(QMainWindow):
         self._pending_conversion = {
             'input_file': input_file,
             'output_file': output_file,
-            'format_options': format_options
+            'format_options': format_options,
         }
-        # --- DRY RUN in background thread ---
-        self.dry_run_thread = QThread()
-        self.dry_run_worker = DryRunWorker(input_file, output_format, format_options)
-        self.dry_run_worker.moveToThread(self.dry_run_thread)
-        self.dry_run_thread.started.connect(self.dry_run_worker.run)
-        self.dry_run_worker.finished.connect(self.on_dry_run_finished)
-        self.dry_run_worker.finished.connect(self.dry_run_thread.quit)
-        self.dry_run_worker.finished.connect(self.dry_run_worker.deleteLater)
-        self.dry_run_thread.finished.connect(self.dry_run_thread.deleteLater)
-        self.dry_run_thread.start()
-
-    def on_dry_run_finished(self, success, est_size_mb, error_msg):
+        # --- DRY RUN on the shared thread pool ---
+        self.dry_run_task = DryRunTask(input_file, output_format, format_options, probe)
+        self.dry_run_task.signals.finished.connect(self.on_dry_run_finished)
+        QThreadPool.globalInstance().start(self.dry_run_task)
+
+    def on_dry_run_finished(self, success, est_size_mb, error_msg, source_duration):
         if not success:
             QMessageBox.critical(self, "Codec/Format Error", f"FFmpeg error: {error_msg}\n\nThis codec/format combination may be incompatible.")
             self.status_label.setText("Dry run failed. Try a different codec or format.")
@@ -959,28 +1430,6 @@ class VideoConverter(QMainWindow):
         msg_box.setWindowTitle("Estimated File Size")
         msg_box.setText(f"{est_size_str}\nProceed with conversion?")
         msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        msg_box.setStyleSheet(
-            """
-            QMessageBox {
-                background-color: #232323;
-                color: #ffffff;
-            }
-            QLabel {
-                color: #ffffff;
-            }
-            QPushButton {
-                color: #ffffff;
-                background-color: #414141;
-                border: 1px solid #555555;
-                padding: 5px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #4a4a4a;
-                border: 1px solid #666666;
-            }
-            """
-        )
         reply = msg_box.exec()
         if reply != QMessageBox.StandardButton.Yes:
             self.status_label.setText("Conversion cancelled.")
@@ -992,7 +1441,7 @@ class VideoConverter(QMainWindow):
             input_file = self._pending_conversion['input_file']
             output_file = self._pending_conversion['output_file']
             format_options = self._pending_conversion['format_options']
-            self.converter_thread = VideoConverterThread(input_file, output_file, format_options)
+            self.converter_thread = VideoConverterThread(input_file, output_file, format_options, source_duration)
             self.converter_thread.progress.connect(self.update_progress)
             self.converter_thread.finished.connect(self.conversion_finished)
             self.converter_thread.error.connect(self.conversion_error)
@@ -1007,15 +1456,11 @@ class VideoConverter(QMainWindow):
         self.status_label.setText("Conversion completed!")
         self.progress_bar.setValue(100)
         # Play the converted video in the output preview
-        output_file = os.path.join(self.output_directory, 
-                                 os.path.splitext(os.path.basename(self.current_video_path))[0] + 
-                                 "_converted." + self.format_combo.currentText())
-        # Ensure output preview is visible and loads the video
-        self.output_preview_player = QMediaPlayer()
-        self.output_preview_audio = QAudioOutput()
-        self.output_preview_player.setAudioOutput(self.output_preview_audio)
+        output_file = os.path.join(self.output_directory,
+                                   f"{self._current_video_stem}_converted.{self.format_combo.currentText()}")
+        # Load the video into the output preview; clear first, as setSource ignores an unchanged URL
+        self.output_preview_player.setSource(QUrl())
         self.output_preview_player.setSource(QUrl.fromLocalFile(output_file))
-        self.output_preview_player.setVideoOutput(self.output_video_widget)
         # Do not autoplay; wait for user to add controls if desired
         # Optionally, you can add play controls for output preview as well
 
@@ -1031,7 +1476,8 @@ class VideoConverter(QMainWindow):
         )
         if directory:
             self.output_directory = directory
-            self.save_location_label.setText(f"Save location: {os.path.basename(directory)}")
+            self._output_dir_basename = os.path.basename(directory)
+            self.save_location_label.setText(f"Save location: {self._output_dir_basename}")
             self.save_settings()
 
     def play_pause(self):
@@ -1079,18 +1525,18 @@ class VideoConverter(QMainWindow):
         duration = self.media_player.duration()
         in_point = self.timeline_widget.in_point
         out_point = self.timeline_widget.out_point
+        fps = self.video_fps
         
-        def format_time(ms):
-            total_seconds = ms // 1000
-            m = total_seconds // 60
-            s = total_seconds % 60
-            # Calculate frames based on video FPS
-            frames = int((ms % 1000) * self.video_fps / 1000)
-            return f"{m:02d}:{s:02d}:{frames:02d}"
+        # Skip the relabel while playback stays within the same frame
+        position_text = format_time(position, fps)
+        key = (position_text, duration, in_point, out_point, fps)
+        if key == self._time_label_key:
+            return
+        self._time_label_key = key
         
         self.time_label.setText(
-            f"{format_time(position)} / {format_time(duration)} "
-            f"[In: {format_time(in_point)} Out: {format_time(out_point)}]"
+            f"{position_text} / {format_time(duration, fps)} "
+            f"[In: {format_time(in_point, fps)} Out: {format_time(out_point, fps)}]"
         )
 
     def playback_state_changed(self, state):
@@ -1100,84 +1546,136 @@ class VideoConverter(QMainWindow):
             self.play_pause_button.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
 
     def update_progress_info(self, info):
-        self.progress_info_text.append(info)
+        self._progress_buffer.append(info)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _flush_progress(self):
+        if not self._progress_buffer:
+            self._progress_timer.stop()
+            return
+        text = '\n'.join(self._progress_buffer)
+        self._progress_buffer.clear()
+        if not self.progress_info_text.document().isEmpty():
+            text = '\n' + text
+        self.progress_info_text.moveCursor(QTextCursor.MoveOperation.End)
+        self.progress_info_text.insertPlainText(text)
         self.progress_info_text.verticalScrollBar().setValue(
             self.progress_info_text.verticalScrollBar().maximum()
         )
 
     def populate_codec_combo(self, codec_list):
-        self.codec_combo.clear()
+        items = []
         for codec in codec_list:
             if codec in self.audio_only_codecs:
-                self.codec_combo.addItem(f"{codec} (audio only)")
+                items.append(f"{codec} (audio only)")
+            elif codec in self.hw_encoders:
+                items.append(f"{codec} (GPU)")
             else:
-                self.codec_combo.addItem(codec)
+                items.append(codec)
+        # Fill in one go with signals blocked, then notify listeners once unless a caller is blocking them
+        was_blocked = self.codec_combo.blockSignals(True)
+        self.codec_combo.clear()
+        self.codec_combo.addItems(items)
+        self.codec_combo.blockSignals(was_blocked)
+        if not was_blocked:
+            self.codec_combo.currentTextChanged.emit(self.codec_combo.currentText())
+
+    def select_preferred_hw_encoder(self, codec_list):
+        hw_codecs = [c for c in codec_list if c in self.hw_encoders]
+        if hw_codecs:
+            # Prefer H.264 for the widest playback support
+            hw_codecs.sort(key=lambda c: not c.startswith('h264_'))
+            self.codec_combo.setCurrentText(f"{hw_codecs[0]} (GPU)")
+
+    def prefetch_muxer_codecs(self):
+        # Warm the get_ffmpeg_muxer_codecs cache so the first format switch is instant
+        formats = [self.format_combo.currentText()]
+        formats += [f for f in COMMON_FORMATS if f in self._ffmpeg_formats_set and f not in formats]
+        QThreadPool.globalInstance().start(lambda: [get_ffmpeg_muxer_codecs(f) for f in formats])
 
     def update_codec_list_for_format(self, format_name):
         allowed_codecs = get_ffmpeg_muxer_codecs(format_name)
         if allowed_codecs:
-            self.populate_codec_combo(allowed_codecs)
-            self.current_allowed_codecs = allowed_codecs
+            # Offer hardware encoders for the codecs this format accepts (e.g. h264_nvenc for h264)
+            hw_codecs = sorted(e for e in self.hw_encoders if e.split('_')[0] in allowed_codecs)
+            codec_list = allowed_codecs + hw_codecs
         else:
-            self.populate_codec_combo(self.ffmpeg_codecs)
-            self.current_allowed_codecs = self.ffmpeg_codecs
+            codec_list = self.ffmpeg_codecs
+        self.populate_codec_combo(codec_list)
+        self.current_allowed_codecs = codec_list
+        self.select_preferred_hw_encoder(codec_list)
 
     def toggle_advanced_options(self):
         visible = self.advanced_toggle_btn.isChecked()
         self.advanced_group.setVisible(visible)
         self.advanced_toggle_btn.setText("Hide Advanced Options" if visible else "Show Advanced Options")
 
+    def _on_crf_changed(self, value):
+        # Coalesce slider drags into at most one label update per frame
+        if self._pending_crf is None:
+            QTimer.singleShot(16, self._update_crf_label)
+        self._pending_crf = value
+
+    def _update_crf_label(self):
+        text = str(self._pending_crf)
+        self._pending_crf = None
+        if self.crf_value_label.text() != text:
+            self.crf_value_label.setText(text)
+
+    def _format_options_template(self, codec):
+        template = self._format_options_templates.get(codec)
+        if template is None:
+            template = self._format_options_templates[codec] = {'vcodec': codec, 'acodec': 'aac'}
+        return template
+
     def update_advanced_options_visibility(self, codec_name):
         if not codec_name or not codec_name.strip():
             self.advanced_group.setVisible(False)
             self.advanced_toggle_btn.setVisible(True)  # Always show the toggle button
+            self._last_visibility_codec = None
             return
         # Remove (audio only) marker if present
         codec = codec_name.split()[0]
+        if codec == self._last_visibility_codec:
+            return
+        self._last_visibility_codec = codec
         self.selected_codec = codec
-        opts = CODEC_OPTIONS.get(codec, {})
+        self._format_options_template(codec)
+        spec = CODEC_SPECS.get(codec, NO_CODEC_SPEC)
+        has_presets = bool(spec.presets)
+        has_passes = spec.passes_range is not None
         # CRF
-        if 'crf' in opts:
-            self.crf_layout.parentWidget().setVisible(True)
-            min_crf, max_crf, default_crf = opts['crf']
+        if spec.has_crf:
+            min_crf, max_crf, default_crf = spec.crf_range
             self.crf_slider.setMinimum(min_crf)
             self.crf_slider.setMaximum(max_crf)
             self.crf_slider.setValue(default_crf)
-            self.crf_label.setVisible(True)
-            self.crf_slider.setVisible(True)
-            self.crf_value_label.setVisible(True)
-        else:
-            self.crf_layout.parentWidget().setVisible(False)
-        # Bitrate
-        if opts.get('bitrate', False):
-            self.bitrate_layout.parentWidget().setVisible(True)
-            self.bitrate_label.setVisible(True)
-            self.bitrate_input.setVisible(True)
-        else:
-            self.bitrate_layout.parentWidget().setVisible(False)
         # Preset
-        if 'preset' in opts:
-            self.preset_layout.parentWidget().setVisible(True)
+        if has_presets:
             self.preset_combo.clear()
-            self.preset_combo.addItems(opts['preset'])
-            self.preset_label.setVisible(True)
-            self.preset_combo.setVisible(True)
-        else:
-            self.preset_layout.parentWidget().setVisible(False)
+            self.preset_combo.addItems(spec.presets)
         # Passes
-        if 'passes' in opts:
-            self.passes_layout.parentWidget().setVisible(True)
-            self.passes_spin.setMinimum(min(opts['passes']))
-            self.passes_spin.setMaximum(max(opts['passes']))
-            self.passes_spin.setValue(min(opts['passes']))
-            self.passes_label.setVisible(True)
-            self.passes_spin.setVisible(True)
-        else:
-            self.passes_layout.parentWidget().setVisible(False)
+        if has_passes:
+            min_passes, max_passes = spec.passes_range
+            self.passes_spin.setMinimum(min_passes)
+            self.passes_spin.setMaximum(max_passes)
+            self.passes_spin.setValue(min_passes)
+        # Only show the controls this codec understands
+        for widget, visible in (
+            (self.crf_label, spec.has_crf),
+            (self.crf_slider, spec.has_crf),
+            (self.crf_value_label, spec.has_crf),
+            (self.bitrate_label, spec.has_bitrate),
+            (self.bitrate_input, spec.has_bitrate),
+            (self.preset_label, has_presets),
+            (self.preset_combo, has_presets),
+            (self.passes_label, has_passes),
+            (self.passes_spin, has_passes),
+        ):
+            widget.setVisible(visible)
         # Show advanced group if any option is visible and toggle is checked
-        show_any = any([
-            'crf' in opts, opts.get('bitrate', False), 'preset' in opts, 'passes' in opts
-        ])
+        show_any = spec.has_crf or spec.has_bitrate or has_presets or has_passes
         self.advanced_group.setVisible(show_any and self.advanced_toggle_btn.isChecked())
         self.advanced_toggle_btn.setVisible(True)  # Always show the toggle button
 
@@ -1186,29 +1684,19 @@ class VideoConverter(QMainWindow):
         if not codec_name or not codec_name.strip():
             return
         codec = codec_name.split()[0]
-        opts = CODEC_OPTIONS.get(codec, {})
-        if 'crf' in opts:
-            min_crf, max_crf, default_crf = opts['crf']
-            self.crf_slider.setValue(default_crf)
-        else:
-            self.crf_slider.setValue(23)
-        if opts.get('bitrate', False):
-            self.bitrate_input.clear()
-        else:
-            self.bitrate_input.clear()
-        if 'preset' in opts:
-            self.preset_combo.setCurrentIndex(0)
-        else:
-            self.preset_combo.setCurrentIndex(0)
-        if 'passes' in opts:
-            self.passes_spin.setValue(min(opts['passes']))
-        else:
-            self.passes_spin.setValue(1)
+        spec = CODEC_SPECS.get(codec, NO_CODEC_SPEC)
+        self.crf_slider.setValue(spec.crf_range[2] if spec.has_crf else 23)
+        self.bitrate_input.clear()
+        self.preset_combo.setCurrentIndex(0)
+        self.passes_spin.setValue(spec.passes_range[0] if spec.passes_range else 1)
         # Force UI update
+        self._last_visibility_codec = None
         self.update_advanced_options_visibility(codec_name)
 
     def closeEvent(self, event):
         self.save_settings()
+        if self._settings_flush_timer.isActive():
+            self.flush_settings(blocking=True)
         super().closeEvent(event)
 
     def keyPressEvent(self, event):
@@ -1238,8 +1726,7 @@ class VideoConverter(QMainWindow):
         elif event.key() == Qt.Key.Key_Left:
             # Move one frame backward
             current_pos = self.media_player.position()
-            frame_duration = int(1000 / self.video_fps)  # Convert to milliseconds
-            new_pos = max(self.timeline_widget.in_point, current_pos - frame_duration)
+            new_pos = max(self.timeline_widget.in_point, current_pos - self._frame_duration_ms)
             self.media_player.setPosition(new_pos)
             self.timeline_widget.setPosition(new_pos)
             self.update_time_label()
@@ -1247,8 +1734,7 @@ class VideoConverter(QMainWindow):
         elif event.key() == Qt.Key.Key_Right:
             # Move one frame forward
             current_pos = self.media_player.position()
-            frame_duration = int(1000 / self.video_fps)  # Convert to milliseconds
-            new_pos = min(self.timeline_widget.out_point, current_pos + frame_duration)
+            new_pos = min(self.timeline_widget.out_point, current_pos + self._frame_duration_ms)
             self.media_player.setPosition(new_pos)
             self.timeline_widget.setPosition(new_pos)
             self.update_time_label()